@@ -1,11 +1,49 @@
 """
 Load monitor config from config.yaml.
 """
+import os
+import threading
 from pathlib import Path
 import yaml
 
+try:  # libyaml C loader when PyYAML was built with it; same semantics as safe_load
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+# abs path -> (st_mtime_ns, st_size, parsed config); avoids re-parsing YAML
+# on every call when the file has not changed.
+_CACHE: dict[str, tuple[int, int, dict]] = {}
+_CACHE_LOCK = threading.Lock()
+
 
 def load_config(path: str | Path = "config.yaml") -> dict:
-    """Load and return the config dict from path (default config.yaml)."""
-    with open(path) as f:
-        return yaml.safe_load(f)
+    """Load and return the config dict from path (default config.yaml).
+
+    The parsed result is memoized keyed by (mtime, size), so repeat calls
+    are a dict lookup unless the file changed on disk. Callers must not
+    mutate the returned dict.
+    """
+    abs_path = os.path.abspath(path)
+    st = os.stat(abs_path)
+    key = (st.st_mtime_ns, st.st_size)
+    with _CACHE_LOCK:
+        cached = _CACHE.get(abs_path)
+        if cached is not None and (cached[0], cached[1]) == key:
+            return cached[2]
+    with open(abs_path) as f:
+        cfg = yaml.load(f, Loader=_Loader)
+    _normalize_targets(cfg)
+    with _CACHE_LOCK:
+        _CACHE[abs_path] = (key[0], key[1], cfg)
+    return cfg
+
+
+def _normalize_targets(cfg: dict) -> None:
+    """Precompute per-target derived fields so adapters don't redo them each poll."""
+    if not isinstance(cfg, dict):
+        return
+    for target in cfg.get("targets") or []:
+        url = target.get("url")
+        if url:
+            target["summary_url"] = url.rstrip("/") + "/api/v2/summary.json"
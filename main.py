@@ -6,10 +6,13 @@ from typing import Any
 import aiohttp
 from config import load_config
 from pipeline.detector import ChangeDetector
+from pipeline.event_log import append_events, run_writer
 from pipeline.formatter import format_event
 from providers.atlassian import AtlassianAdapter
 from providers.base import BaseAdapter
 
+STATE_PATH = "detector_state.json"
+
 
 def get_adapter(provider: str) -> BaseAdapter:
     """Return the adapter for the given provider (only atlassian supported for now)."""
@@ -27,9 +30,10 @@ async def run_once(
     detector: ChangeDetector,
 ) -> None:
     """Scrape one target, filter to new events, print formatted."""
-    events = await adapter.fetch_events(session, target)
-    new = detector.filter_new(events)
+    batch = await adapter.fetch_events(session, target)
+    new = detector.filter_new_batch(batch)
     name = target.get("name", "?")
+    append_events(new)
     for e in new:
         print(format_event(e))
     if not new:
@@ -50,20 +54,33 @@ async def run_target_loop(
         await asyncio.sleep(interval)
 
 
+async def run_state_saver(detector: ChangeDetector, interval: int = 30) -> None:
+    """Periodically persist the detector snapshot (no-op while nothing changed)."""
+    while True:
+        await asyncio.sleep(interval)
+        detector.save()
+
+
 async def main() -> None:
     cfg = load_config()
     targets = cfg["targets"]
     default_interval = cfg.get("scrape_interval", 30)
-    detector = ChangeDetector()
+    detector = ChangeDetector(STATE_PATH)
     adapters = [(t, get_adapter(t["provider"])) for t in targets]
 
-    async with aiohttp.ClientSession() as session:
-        await asyncio.gather(
-            *[
-                run_target_loop(session, target, adapter, detector, default_interval)
-                for target, adapter in adapters
-            ]
-        )
+    # Keep-alive connections and cached DNS across poll cycles; per-host
+    # cap so one slow provider cannot hog the connection pool.
+    connector = aiohttp.TCPConnector(
+        limit=0, limit_per_host=8, keepalive_timeout=60, ttl_dns_cache=300
+    )
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async with asyncio.TaskGroup() as tg:
+            for target, adapter in adapters:
+                tg.create_task(
+                    run_target_loop(session, target, adapter, detector, default_interval)
+                )
+            tg.create_task(run_state_saver(detector))
+            tg.create_task(run_writer())
 
 
 if __name__ == "__main__":
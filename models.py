@@ -1,4 +1,7 @@
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Hashable
+
 from pydantic import BaseModel
 
 
@@ -13,3 +16,52 @@ class UnifiedEvent(BaseModel):
     timestamp: datetime
     event_id: str
 
+
+@dataclass(slots=True)
+class EventBatch:
+    """
+    Struct-of-arrays batch of events: one parallel list per UnifiedEvent
+    field instead of one object per event. Adapters fill batches on the
+    polling path; the detector scans the keys column and only rows that
+    turn out to be new are materialized into UnifiedEvent objects.
+    """
+    source_id: list[str] = field(default_factory=list)
+    product_name: list[str] = field(default_factory=list)
+    status: list[str] = field(default_factory=list)
+    message: list[str] = field(default_factory=list)
+    timestamp: list[datetime] = field(default_factory=list)
+    event_id: list[str] = field(default_factory=list)
+    # per-event dedup key, e.g. (incident_id, update_id)
+    keys: list[Hashable] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.event_id)
+
+    def append(
+        self,
+        source_id: str,
+        product_name: str,
+        status: str,
+        message: str,
+        timestamp: datetime,
+        event_id: str,
+        key: Hashable,
+    ) -> None:
+        self.source_id.append(source_id)
+        self.product_name.append(product_name)
+        self.status.append(status)
+        self.message.append(message)
+        self.timestamp.append(timestamp)
+        self.event_id.append(event_id)
+        self.keys.append(key)
+
+    def row(self, i: int) -> UnifiedEvent:
+        """Materialize row i as a UnifiedEvent (fields are already normalized)."""
+        return UnifiedEvent.model_construct(
+            source_id=self.source_id[i],
+            product_name=self.product_name[i],
+            status=self.status[i],
+            message=self.message[i],
+            timestamp=self.timestamp[i],
+            event_id=self.event_id[i],
+        )
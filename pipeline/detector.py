@@ -1,21 +1,86 @@
 """
 In-memory change detector: tracks seen event_ids per source, returns only new events.
 """
-from models import UnifiedEvent
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Hashable, Iterable, Iterator
+
+from models import EventBatch, UnifiedEvent
+
+# Per-source cap on remembered ids; oldest entries are evicted first so
+# memory stays flat for a long-running monitor. Statuspage only surfaces
+# recent incidents, so an evicted (ancient) id cannot realistically recur.
+MAX_SEEN_PER_SOURCE = 10_000
 
 
 class ChangeDetector:
-    """Tracks seen event_ids per source_id; filter_new() returns only events not seen before."""
+    """Tracks seen event_ids per source_id; filter_new() returns only events not seen before.
+
+    When constructed with a path, the seen-id table is loaded from that
+    file and save() writes it back, so a restarted process does not
+    re-report everything as new.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self._seen: dict[str, OrderedDict[str, None]] = {}
+        self._path = Path(path) if path is not None else None
+        self._dirty = False
+        if self._path is not None and self._path.exists():
+            try:
+                raw = json.loads(self._path.read_text())
+            except (json.JSONDecodeError, OSError):
+                raw = {}
+            # JSON turns tuple keys into lists; restore them so they hash.
+            self._seen = {
+                src: OrderedDict.fromkeys(
+                    tuple(k) if isinstance(k, list) else k for k in ids
+                )
+                for src, ids in raw.items()
+            }
 
-    def __init__(self) -> None:
-        self._seen: dict[str, set[str]] = {}
+    def _mark_new(self, source_id: str, key: Hashable) -> bool:
+        """Return True (and remember key) if key is unseen for source_id."""
+        source_seen = self._seen.setdefault(source_id, OrderedDict())
+        if key in source_seen:
+            return False
+        source_seen[key] = None
+        if len(source_seen) > MAX_SEEN_PER_SOURCE:
+            source_seen.popitem(last=False)
+        return True
 
-    def filter_new(self, events: list[UnifiedEvent]) -> list[UnifiedEvent]:
-        """Return only events whose event_id has not been seen for their source_id. Mark them seen."""
-        new: list[UnifiedEvent] = []
+    def filter_new(self, events: Iterable[UnifiedEvent]) -> Iterator[UnifiedEvent]:
+        """Yield only events whose event_id has not been seen for their source_id. Mark them seen.
+
+        A generator so it composes with generator-producing adapters:
+        events flow through parse -> filter in one pass with no
+        intermediate list.
+        """
         for e in events:
-            source_seen = self._seen.setdefault(e.source_id, set())
-            if e.event_id not in source_seen:
-                source_seen.add(e.event_id)
-                new.append(e)
+            if self._mark_new(e.source_id, e.event_id):
+                self._dirty = True
+                yield e
+
+    def filter_new_batch(self, batch: EventBatch) -> list[UnifiedEvent]:
+        """Scan a batch's key column and materialize only the unseen rows.
+
+        Already-seen rows (the common case on a poll) never become
+        UnifiedEvent objects at all.
+        """
+        sources = batch.source_id
+        new = [
+            batch.row(i)
+            for i, key in enumerate(batch.keys)
+            if self._mark_new(sources[i], key)
+        ]
+        if new:
+            self._dirty = True
         return new
+
+    def save(self) -> None:
+        """Write the seen-id snapshot to disk, but only if it changed since the last save."""
+        if self._path is None or not self._dirty:
+            return
+        self._dirty = False
+        snapshot = {src: list(ids) for src, ids in self._seen.items()}
+        self._path.write_text(json.dumps(snapshot))
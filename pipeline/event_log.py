@@ -0,0 +1,210 @@
+"""
+Append-only JSONL log of emitted events (events.jsonl), with buffered writes.
+"""
+import asyncio
+import bisect
+import fcntl
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+try:  # orjson serializes datetimes natively and returns bytes
+    import orjson
+except ImportError:
+    orjson = None
+
+from models import UnifiedEvent
+
+LOG_PATH = "events.jsonl"
+MAX_FILE_BYTES = 100 * 1024
+RETENTION = timedelta(hours=24)
+
+_FLUSH_AT_EVENTS = 32
+_FLUSH_AT_SECONDS = 5.0
+_MAX_BATCH = 256  # queue items folded into one write before yielding again
+
+# Writes are buffered so rapid polling does not pay an open/write/stat per
+# call; the buffer is flushed in one write every _FLUSH_AT_EVENTS events or
+# _FLUSH_AT_SECONDS seconds. The size check runs only after enough bytes
+# have been appended to plausibly cross the cap.
+_PENDING: list[bytes] = []
+_LAST_FLUSH = time.monotonic()
+_BYTES_SINCE_CHECK = 0
+
+# Set while run_writer is active: appends then go through the queue and the
+# actual file write happens in a worker thread, never on the event loop.
+_QUEUE: asyncio.Queue[list[bytes]] | None = None
+
+# flush() may run on the caller's thread or in run_writer's worker thread;
+# each keeps its own reusable scratch buffer so assembling the write does
+# not allocate a fresh bytes object per flush.
+_SCRATCH = threading.local()
+
+# flush() runs concurrently once both run_writer (via to_thread) and the
+# events API (read_last_events, also via to_thread) are active. _LOCK
+# serializes every _PENDING mutation and the write/trim so overlapping
+# flushes neither duplicate lines nor drop them to a racing clear().
+_LOCK = threading.Lock()
+
+
+def _event_to_line(e: UnifiedEvent) -> bytes:
+    """Serialize one event to a newline-terminated JSON line (bytes)."""
+    if orjson is not None:
+        # Serialize the field dict directly; orjson handles datetime, so we
+        # skip model_dump's intermediate dict copy and ISO formatting.
+        return orjson.dumps(e.__dict__, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(e.model_dump(mode="json")) + "\n").encode()
+
+
+def append_events(events: list[UnifiedEvent]) -> None:
+    """Queue events for the log; flushed in batches rather than per call.
+
+    With a writer running (run_writer), this only serializes and enqueues;
+    the disk write happens off the event loop. Without one, it falls back
+    to buffered synchronous writes.
+    """
+    if events:
+        lines = [_event_to_line(e) for e in events]
+        if _QUEUE is not None:
+            try:
+                _QUEUE.put_nowait(lines)
+                return
+            except asyncio.QueueFull:
+                # writer has fallen behind; take the synchronous path below
+                # rather than bubbling an error (and losing the events) out
+                # of the caller
+                pass
+        with _LOCK:
+            _PENDING.extend(lines)
+    if _PENDING and (
+        len(_PENDING) >= _FLUSH_AT_EVENTS
+        or time.monotonic() - _LAST_FLUSH >= _FLUSH_AT_SECONDS
+    ):
+        flush()
+
+
+async def run_writer() -> None:
+    """Drain queued lines and write them in batches in a worker thread.
+
+    Run as a background task by both the poller and the webhook server so
+    a slow disk stalls neither of them.
+    """
+    global _QUEUE
+    _QUEUE = asyncio.Queue(maxsize=10_000)
+    try:
+        while True:
+            batch = [await _QUEUE.get()]
+            while len(batch) < _MAX_BATCH:  # take whatever else already arrived
+                try:
+                    batch.append(_QUEUE.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            with _LOCK:
+                _PENDING.extend(line for lines in batch for line in lines)
+            await asyncio.to_thread(flush)
+    finally:
+        # fold anything still queued into the final flush so shutdown
+        # (or writer cancellation) loses no events
+        while True:
+            try:
+                lines = _QUEUE.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            with _LOCK:
+                _PENDING.extend(lines)
+        _QUEUE = None
+        flush()
+
+
+def flush() -> None:
+    """Write all pending lines in one append; trim the file if it grew past the cap."""
+    global _LAST_FLUSH, _BYTES_SINCE_CHECK
+    with _LOCK:
+        _LAST_FLUSH = time.monotonic()
+        if not _PENDING:
+            return
+        buf = getattr(_SCRATCH, "buf", None)
+        if buf is None:
+            # sized once per thread; a normal flush fits well within 64 KiB
+            buf = _SCRATCH.buf = bytearray(64 * 1024)
+        del buf[:]
+        for line in _PENDING:
+            buf += line
+        _PENDING.clear()
+        with open(LOG_PATH, "ab") as f:
+            # exclusive inter-process lock: under multi-worker uvicorn every
+            # process appends to the same file, and _trim's read-then-rewrite
+            # must not interleave with another worker's append
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.write(buf)
+            _BYTES_SINCE_CHECK += len(buf)
+            if _BYTES_SINCE_CHECK > MAX_FILE_BYTES // 4:
+                _BYTES_SINCE_CHECK = 0
+                f.flush()
+                if os.path.getsize(LOG_PATH) > MAX_FILE_BYTES:
+                    _trim()
+
+
+def read_last_events(limit: int = 200) -> list[dict]:
+    """Return up to limit most recent logged events as dicts, newest first."""
+    flush()
+    if not os.path.exists(LOG_PATH):
+        return []
+    loads = json.loads if orjson is None else orjson.loads
+    with open(LOG_PATH, "rb") as f:
+        # shared lock so a concurrent worker's trim rewrite is never
+        # observed half-done
+        fcntl.flock(f, fcntl.LOCK_SH)
+        size = os.fstat(f.fileno()).st_size
+        # lines are short; a bounded tail covers any sane limit
+        window = min(size, max(4096, 512 * limit))
+        f.seek(size - window)
+        lines = f.read().split(b"\n")
+    if window < size:
+        del lines[0]  # first line of the window is likely partial
+    out: list[dict] = []
+    for line in reversed(lines):
+        if not line:
+            continue
+        try:
+            out.append(loads(line))
+        except ValueError:
+            continue
+        if len(out) >= limit:
+            break
+    return out
+
+
+def _line_ts(line: bytes) -> bytes:
+    """Extract the raw ISO timestamp value from a JSON line without parsing it."""
+    i = line.find(b'"timestamp"')
+    if i == -1:
+        return b""
+    j = line.find(b'"', i + 12) + 1
+    k = line.find(b'"', j)
+    return line[j:k] if j and k != -1 else b""
+
+
+def _trim() -> None:
+    """Drop events older than the retention window, touching only the file tail.
+
+    Lines are appended in chronological order and ISO timestamps sort
+    lexicographically, so instead of parsing the whole log we read a window
+    from the end, binary-search the cutoff over the raw timestamp strings,
+    and rewrite just the surviving lines.
+    """
+    cutoff = (datetime.now(timezone.utc) - RETENTION).isoformat().encode()
+    size = os.path.getsize(LOG_PATH)
+    window = min(size, 2 * MAX_FILE_BYTES)
+    with open(LOG_PATH, "rb") as f:
+        f.seek(size - window)
+        tail = f.read().split(b"\n")
+    if window < size:
+        del tail[0]  # first line of the window is likely partial
+    if tail and not tail[-1]:
+        del tail[-1]  # trailing empty piece after the final newline
+    start = bisect.bisect_left(tail, cutoff, key=_line_ts)
+    with open(LOG_PATH, "wb") as f:
+        f.write(b"".join(line + b"\n" for line in tail[start:]))
@@ -8,5 +8,7 @@ from models import UnifiedEvent
 
 def format_event(event: UnifiedEvent) -> str:
     """Turn one event into the required console lines: [timestamp] Product: ... / Status: ..."""
-    ts = event.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+    t = event.timestamp
+    # f-string instead of strftime: same output, no per-call format parsing
+    ts = f"{t.year:04d}-{t.month:02d}-{t.day:02d} {t.hour:02d}:{t.minute:02d}:{t.second:02d}"
     return f"[{ts}] Product: {event.product_name}\nStatus: {event.message}"
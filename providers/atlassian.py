@@ -2,127 +2,110 @@
 Atlassian Statuspage adapter: fetches summary.json and normalizes to UnifiedEvent.
 """
 
-import json
+import sys
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator
 
 import aiohttp
-from pydantic import BaseModel
+import ijson
 
-from models import UnifiedEvent
-from providers.base import BaseAdapter
+try:  # orjson parses bytes directly, several times faster than stdlib json
+    from orjson import JSONDecodeError, loads
+except ImportError:
+    from json import JSONDecodeError, loads
 
+from models import EventBatch, UnifiedEvent
+from providers.base import BaseAdapter, WebhookHeaders
 
-class PageInfo(BaseModel):
-    id: str
-    name: str
-    url: str
-    updated_at: str | None = None
-
-class IncidentUpdate(BaseModel):
-    id: str
-    body: str
-    status: str
-    created_at: str
-    updated_at: str | None = None
-
-class Incident(BaseModel):
-    id: str
-    name: str
-    impact: str
-    status: str
-    incident_updates: list[IncidentUpdate] = []
-    created_at: str | None = None
-    updated_at: str | None = None
-
-class Component(BaseModel):
-    id: str
-    name: str
-    status: str
-
-
-class StatusPageSummary(BaseModel):
-    """Parsed response from /api/v2/summary.json."""
-    page: PageInfo
-    components: list[Component] = []
-    incidents: list[Incident] = []
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts the trailing Z directly on 3.11+, so skip the
+    # per-call replace() and its string allocation.
+    _parse_ts = datetime.fromisoformat
+else:
+    def _parse_ts(raw: str) -> datetime:
+        return datetime.fromisoformat(raw.replace("Z", "+00:00"))
 
 
 class AtlassianAdapter(BaseAdapter):
     """Fetch and normalize Atlassian Statuspage summary.json."""
 
     def __init__(self) -> None:
-        # url -> (summary, last_modified) for conditional GET
-        self._cache: dict[str, tuple[StatusPageSummary, str]] = {}
+        # url -> (normalized batch, last_modified, etag) for conditional GET
+        self._cache: dict[str, tuple[EventBatch, str, str]] = {}
+
+    def _append_incident_events(
+        self, incident: dict[str, Any], source_id: str, out: EventBatch
+    ) -> None:
+        """Append one batch row per update of the given incident to out."""
+        inc_id = incident.get("id", "")
+        name = incident.get("name", "Incident")
+        for update in incident.get("incident_updates", []):
+            timestamp = _parse_ts(update["created_at"])
+            upd_id = update.get("id", "")
+            out.append(
+                source_id,
+                name,
+                update.get("status", ""),
+                update.get("body", ""),
+                timestamp,
+                f"{inc_id}_{upd_id}",
+                (inc_id, upd_id),
+            )
 
-    async def fetch_summary(
+    async def fetch_events(
         self,
         session: aiohttp.ClientSession,
         target: dict[str, Any],
-    ) -> StatusPageSummary:
-        """GET summary.json; use If-Modified-Since and return cached summary on 304."""
-        base_url = target["url"].rstrip("/")
-        url = f"{base_url}/api/v2/summary.json"
+    ) -> EventBatch:
+        """GET summary.json and return a normalized event batch, streaming the parse.
+
+        Incidents are decoded one at a time with ijson straight off the
+        response body, so peak memory is one incident rather than the whole
+        JSON tree. Conditional GET (If-Modified-Since/If-None-Match) returns
+        the cached normalized batch on 304.
+        """
+        # summary_url is precomputed by load_config; build it only for
+        # targets constructed by hand.
+        url = target.get("summary_url") or target["url"].rstrip("/") + "/api/v2/summary.json"
+        source_id = target.get("name") or target["url"]
         headers: dict[str, str] = {}
         if url in self._cache:
-            _, last_modified = self._cache[url]
-            headers["If-Modified-Since"] = last_modified
+            _, last_modified, etag = self._cache[url]
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+            if etag:
+                headers["If-None-Match"] = etag
         async with session.get(url, headers=headers or None) as resp:
             if resp.status == 304:
                 return self._cache[url][0]
             resp.raise_for_status()
             last_modified = resp.headers.get("Last-Modified") or ""
-            data = await resp.json()
-        summary = StatusPageSummary(
-            page=PageInfo(**data["page"]),
-            components=[Component(**c) for c in data.get("components", [])],
-            incidents=[Incident(**i) for i in data.get("incidents", [])],
-        )
-        self._cache[url] = (summary, last_modified)
-        return summary
-
-    def _normalize_to_events(self, summary: StatusPageSummary, source_id: str) -> list[UnifiedEvent]:
-        """Turn summary incidents and their updates into UnifiedEvents (one per update)."""
-        events: list[UnifiedEvent] = []
-        for incident in summary.incidents:
-            for update in incident.incident_updates:
-                ts = update.created_at.replace("Z", "+00:00")
-                timestamp = datetime.fromisoformat(ts)
-                events.append(
-                    UnifiedEvent(
-                        source_id=source_id,
-                        product_name=incident.name,
-                        status=update.status,
-                        message=update.body,
-                        timestamp=timestamp,
-                        event_id=f"{incident.id}_{update.id}",
-                    )
-                )
-        return events
-
-    async def fetch_events(
-        self,
-        session: aiohttp.ClientSession,
-        target: dict[str, Any],
-    ) -> list[UnifiedEvent]:
-        """Fetch summary and return normalized unified events."""
-        summary = await self.fetch_summary(session, target)
-        source_id = target.get("name", summary.page.name)
-        return self._normalize_to_events(summary, source_id)
+            etag = resp.headers.get("ETag") or ""
+            batch = EventBatch()
+            async for incident in ijson.items(resp.content, "incidents.item"):
+                self._append_incident_events(incident, source_id, batch)
+        self._cache[url] = (batch, last_modified, etag)
+        return batch
 
     def parse_webhook(
         self,
         body: bytes | str,
-        headers: dict[str, str],
-    ) -> list[UnifiedEvent]:
-        """Parse Statuspage webhook POST (incident or component_update) into unified events."""
-        if isinstance(body, bytes):
-            body = body.decode("utf-8")
-        try:
-            data = json.loads(body)
-        except json.JSONDecodeError:
-            return []
-        events: list[UnifiedEvent] = []
+        headers: WebhookHeaders,
+        preparsed: dict | None = None,
+    ) -> Iterator[UnifiedEvent]:
+        """Yield unified events from a Statuspage webhook POST (incident or component_update).
+
+        A generator: events stream straight into the caller's filtering
+        without being collected into a list here first.
+        """
+        data = preparsed
+        if data is None:
+            try:
+                data = loads(body)
+            except JSONDecodeError:
+                return
+        if not isinstance(data, dict):
+            return
         page = data.get("page") or {}
         source_id = page.get("id", "atlassian")
         if "incident" in data:
@@ -130,37 +113,32 @@ class AtlassianAdapter(BaseAdapter):
             name = inc.get("name", "Incident")
             inc_id = inc.get("id", "")
             for upd in inc.get("incident_updates", []):
-                ts = (upd.get("created_at") or "").replace("Z", "+00:00")
+                ts = upd.get("created_at") or ""
                 try:
-                    timestamp = datetime.fromisoformat(ts) if ts else datetime.now()
+                    timestamp = _parse_ts(ts) if ts else datetime.now()
                 except ValueError:
                     timestamp = datetime.now()
-                events.append(
-                    UnifiedEvent(
-                        source_id=source_id,
-                        product_name=name,
-                        status=upd.get("status", ""),
-                        message=upd.get("body", ""),
-                        timestamp=timestamp,
-                        event_id=f"{inc_id}_{upd.get('id', '')}",
-                    )
+                yield UnifiedEvent(
+                    source_id=source_id,
+                    product_name=name,
+                    status=upd.get("status", ""),
+                    message=upd.get("body", ""),
+                    timestamp=timestamp,
+                    event_id=f"{inc_id}_{upd.get('id', '')}",
                 )
         if "component_update" in data and "component" in data:
             comp = data["component"]
             upd = data["component_update"]
-            ts = (upd.get("created_at") or "").replace("Z", "+00:00")
+            ts = upd.get("created_at") or ""
             try:
-                timestamp = datetime.fromisoformat(ts) if ts else datetime.now()
+                timestamp = _parse_ts(ts) if ts else datetime.now()
             except ValueError:
                 timestamp = datetime.now()
-            events.append(
-                UnifiedEvent(
-                    source_id=source_id,
-                    product_name=comp.get("name", "Component"),
-                    status=upd.get("new_status", ""),
-                    message=f"Status: {upd.get('old_status', '')} -> {upd.get('new_status', '')}",
-                    timestamp=timestamp,
-                    event_id=f"comp_{comp.get('id', '')}_{upd.get('id', '')}",
-                )
+            yield UnifiedEvent(
+                source_id=source_id,
+                product_name=comp.get("name", "Component"),
+                status=upd.get("new_status", ""),
+                message=f"Status: {upd.get('old_status', '')} -> {upd.get('new_status', '')}",
+                timestamp=timestamp,
+                event_id=f"comp_{comp.get('id', '')}_{upd.get('id', '')}",
             )
-        return events
@@ -4,9 +4,23 @@ Each provider implements fetch_events (pull) and optionally parse_webhook (push)
 """
 
 from abc import ABC, abstractmethod
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Iterator
 import aiohttp
-from models import UnifiedEvent
+from models import EventBatch, UnifiedEvent
+
+
+@dataclass(slots=True)
+class WebhookHeaders:
+    """The few request headers adapters care about, extracted once per webhook.
+
+    Passing this instead of the full header mapping keeps adapters from
+    doing per-header lookups against the raw request.
+    """
+
+    signature: str | None = None
+    user_agent: str | None = None
+    content_type: str | None = None
 
 
 class BaseAdapter(ABC):
@@ -19,9 +33,10 @@ class BaseAdapter(ABC):
         self,
         session: "aiohttp.ClientSession",
         target: dict[str, Any],
-    ) -> list[UnifiedEvent]:
+    ) -> EventBatch:
         """
-        Fetch current state from the provider's API and return normalized events.
+        Fetch current state from the provider's API and return a normalized
+        event batch (column-per-field; see models.EventBatch).
         target: config dict with at least 'name' and 'url'.
         """
         pass
@@ -29,10 +44,16 @@ class BaseAdapter(ABC):
     def parse_webhook(
         self,
         body: bytes | str,
-        headers: dict[str, str],
-    ) -> list[UnifiedEvent]:
+        headers: WebhookHeaders,
+        preparsed: dict | None = None,
+    ) -> Iterator[UnifiedEvent]:
         """
-        Parse a webhook POST body and headers into unified events.
+        Parse a webhook POST body and headers, yielding unified events.
+        Implemented as a generator so callers can stream events straight
+        into filtering without an intermediate list.
+        headers: the relevant headers already plucked from the request.
+        preparsed: the already-decoded JSON body, when the caller parsed it
+        during provider detection, so the adapter need not parse twice.
         Optional: override in provider if webhooks are supported.
         """
-        return []
+        return iter(())
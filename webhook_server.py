@@ -1,52 +1,306 @@
 """
 Webhook receiver: accept provider webhook POSTs, detect provider from payload, dispatch to adapter, print.
+Also serves a small dashboard (GET /) backed by GET /api/events.
 """
-import json
-from fastapi import FastAPI, Request
-from fastapi.responses import PlainTextResponse
+import asyncio
+import gzip
+import re
+import sys
+from collections import OrderedDict
+from hashlib import blake2b
+
+import orjson
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
+from starlette.middleware.gzip import GZipMiddleware
 from models import UnifiedEvent
 from pipeline.detector import ChangeDetector
+from pipeline.event_log import append_events, read_last_events, run_writer
 from pipeline.formatter import format_event
 from providers.atlassian import AtlassianAdapter
-from providers.base import BaseAdapter
+from providers.base import BaseAdapter, WebhookHeaders
 
 app = FastAPI()
+# /api/events is large, repetitive JSON; stream-compress anything above 1KB
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 detector = ChangeDetector()
-_adapters: dict[str, BaseAdapter] = {"atlassian": AtlassianAdapter()}
+_ATLASSIAN_ADAPTER = AtlassianAdapter()
+
+# Statuspage re-delivers identical payloads (retries, multi-region); remember
+# hashes of recent bodies so replays skip parsing/filtering entirely.
+# BLAKE2b at 16 bytes is faster than SHA-1 and plenty for dedup keys.
+_RECENT_BODIES: OrderedDict[bytes, None] = OrderedDict()
+_RECENT_BODIES_MAX = 4096
+
+_writer_task: asyncio.Task | None = None
+
+# Webhook payloads are a few KB; anything near this is hostile or broken.
+_MAX_BODY_BYTES = 1024 * 1024
+
+# The happy-path reply never varies; build it once instead of allocating a
+# response (headers, encoded body) per request. Starlette responses are
+# plain holders of (status, headers, body) and are safe to resend.
+_OK_RESPONSE = PlainTextResponse("OK")
+
+
+async def _read_body(request: Request) -> bytes | None:
+    """Read the request body with a hard size cap; None means oversize.
 
+    Unlike request.body(), which buffers unboundedly into a list of chunks
+    before joining, this accumulates into one bytearray and bails out as
+    soon as the total crosses _MAX_BODY_BYTES.
+    """
+    buf = bytearray()
+    async for chunk in request.stream():
+        buf += chunk
+        if len(buf) > _MAX_BODY_BYTES:
+            return None
+    return bytes(buf)
 
-def _detect_webhook_provider(body: bytes) -> str | None:
-    """Infer provider from webhook payload shape. Returns 'atlassian', 'status_io', or None."""
-    try:
-        data = json.loads(body.decode("utf-8") if isinstance(body, bytes) else body)
-    except (json.JSONDecodeError, UnicodeDecodeError):
-        return None
-    if not isinstance(data, dict):
-        return None
+
+@app.on_event("startup")
+async def _start_log_writer() -> None:
+    """Run the event-log writer so appends never block the event loop."""
+    global _writer_task
+    _writer_task = asyncio.create_task(run_writer())
+
+
+@app.on_event("shutdown")
+async def _stop_log_writer() -> None:
+    """Stop the writer; its teardown flushes everything still queued."""
+    if _writer_task is not None:
+        _writer_task.cancel()
+        try:
+            await _writer_task
+        except asyncio.CancelledError:
+            pass
+
+
+# Payload shape per provider: (adapter, required top-level key, any-of event
+# keys). Adding a provider is one row here.
+_PROVIDER_SHAPES: tuple[tuple[BaseAdapter, str, tuple[str, ...]], ...] = (
     # Atlassian Statuspage: has "page" and ("incident" or "component_update")
-    if "page" in data and ("incident" in data or "component_update" in data):
-        return "atlassian"
+    (_ATLASSIAN_ADAPTER, "page", ("incident", "component_update")),
     # Status.io (placeholder for future): different shape
-    # if "result" in data or "status_overall" in data:
-    #     return "status_io"
-    return None
+    # (_STATUS_IO_ADAPTER, "status_overall", ("result",)),
+)
+# All provider marker keys folded into one scanner: each marker gets a bit
+# and a single compiled-alternation pass over the body collects a bitmask,
+# so the prefilter stays one linear scan no matter how many providers the
+# shape table grows. (A C Aho-Corasick automaton would do the same; for a
+# handful of short literals re's alternation is equivalent and needs no
+# extra dependency.)
+_MARKER_BITS: dict[bytes, int] = {}
+for _adapter, _required, _event_keys in _PROVIDER_SHAPES:
+    for _key in (_required, *_event_keys):
+        _MARKER_BITS.setdefault(b'"%s"' % _key.encode(), 1 << len(_MARKER_BITS))
+_MARKER_RE = re.compile(b"|".join(map(re.escape, _MARKER_BITS)))
+# Per provider: bit of the required key, OR of the any-of event-key bits.
+_PROVIDER_MASKS = tuple(
+    (
+        adapter,
+        required,
+        event_keys,
+        _MARKER_BITS[b'"%s"' % required.encode()],
+        sum(_MARKER_BITS[b'"%s"' % k.encode()] for k in event_keys),
+    )
+    for adapter, required, event_keys in _PROVIDER_SHAPES
+)
+
+
+def _detect_adapter(body: bytes) -> tuple[BaseAdapter | None, dict | None]:
+    """Match the payload shape to its adapter. Returns (adapter, parsed body).
 
+    One linear scan collects the bitmask of marker keys present anywhere in
+    the body; non-matching bodies (health checks, probes, garbage) are
+    rejected with no JSON parse at all. Only a mask satisfying some
+    provider's shape triggers the decode, and the marker keys are then
+    checked on the real top level. The adapter is returned directly -- no
+    name-to-adapter lookup on the hot path -- along with the parsed dict so
+    it need not be parsed a second time.
+    """
+    mask = 0
+    for m in _MARKER_RE.finditer(body):
+        mask |= _MARKER_BITS[m.group()]
+    data: dict | None = None
+    for adapter, required, event_keys, req_bit, event_bits in _PROVIDER_MASKS:
+        if not (mask & req_bit and mask & event_bits):
+            continue
+        if data is None:
+            try:
+                data = orjson.loads(body)
+            except orjson.JSONDecodeError:
+                return None, None
+        if isinstance(data, dict) and required in data:
+            for key in event_keys:
+                if key in data:
+                    return adapter, data
+    return None, None
 
-@app.post("/webhook", response_class=PlainTextResponse)
-async def webhook(request: Request) -> str:
+
+@app.post("/webhook", response_class=PlainTextResponse, response_model=None)
+async def webhook(request: Request) -> Response:
     """Accept webhook POST; detect provider, parse via adapter, detect new, format and print."""
-    body = await request.body()
-    headers = {k: v for k, v in request.headers.items()}
-    provider = _detect_webhook_provider(body)
-    events: list[UnifiedEvent] = []
-    if provider and provider in _adapters:
-        events = _adapters[provider].parse_webhook(body, headers)
-    new = detector.filter_new(events)
-    for e in new:
-        print(format_event(e))
-    return "OK"
+    body = await _read_body(request)
+    if body is None:
+        return PlainTextResponse("payload too large", status_code=413)
+    digest = blake2b(body, digest_size=16).digest()
+    if digest in _RECENT_BODIES:
+        return _OK_RESPONSE
+    _RECENT_BODIES[digest] = None
+    if len(_RECENT_BODIES) > _RECENT_BODIES_MAX:
+        _RECENT_BODIES.popitem(last=False)
+    # Pluck just the headers adapters care about; three direct gets instead
+    # of handing every adapter the full header map.
+    headers = WebhookHeaders(
+        signature=request.headers.get("x-statuspage-signature"),
+        user_agent=request.headers.get("user-agent"),
+        content_type=request.headers.get("content-type"),
+    )
+    # Well-behaved senders identify themselves (Statuspage-Webhook/...);
+    # trust the header and skip body sniffing. Body-shape detection stays
+    # as the fallback for senders without one.
+    if headers.user_agent and "statuspage" in headers.user_agent.lower():
+        adapter, data = _ATLASSIAN_ADAPTER, None
+    else:
+        adapter, data = _detect_adapter(body)
+    new: list[UnifiedEvent] = []
+    if adapter is not None:
+        # parse -> filter is one streamed pass; only new events are collected
+        new = list(
+            detector.filter_new(adapter.parse_webhook(body, headers, preparsed=data))
+        )
+    append_events(new)  # non-blocking: enqueues for the background writer
+    if new:
+        # one write for the whole burst instead of a print (and syscall) per
+        # event; go through the binary buffer to skip the text-layer lock
+        buf = ("\n".join(format_event(e) for e in new) + "\n").encode()
+        sys.stdout.buffer.write(buf)
+        sys.stdout.buffer.flush()
+    return _OK_RESPONSE
+
+
+# The dashboard is static: encode it once and let conditional GETs skip the
+# body entirely via a content-derived ETag.
+_INDEX_HTML: bytes = b"""<!doctype html>
+<html>
+<head>
+<title>statusPageLogs</title>
+<style>
+body { font-family: sans-serif; margin: 2em; }
+table { border-collapse: collapse; width: 100%; }
+td, th { border: 1px solid #ccc; padding: 4px 8px; text-align: left; }
+</style>
+</head>
+<body>
+<h1>Status events</h1>
+<table id="events">
+<tr><th>Time</th><th>Source</th><th>Product</th><th>Status</th><th>Message</th></tr>
+</table>
+<script>
+// Stream NDJSON and render rows as they arrive, so first rows paint before
+// the full response has even been serialized server-side.
+async function load() {
+  const table = document.getElementById('events');
+  const resp = await fetch('/api/events.ndjson?limit=200');
+  const reader = resp.body.getReader();
+  const decoder = new TextDecoder();
+  let tail = '';
+  let frag = document.createDocumentFragment();
+  let pending = 0;
+  const flush = () => { table.appendChild(frag); frag = document.createDocumentFragment(); pending = 0; };
+  const addRow = e => {
+    const tr = document.createElement('tr');
+    // textContent, not innerHTML: these fields arrive from webhook bodies
+    [e.timestamp, e.source_id, e.product_name, e.status, e.message].forEach(v => {
+      const td = document.createElement('td');
+      td.textContent = v;
+      tr.appendChild(td);
+    });
+    frag.appendChild(tr);
+    if (++pending >= 50) flush();  // batch layout every 50 rows
+  };
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    const lines = (tail + decoder.decode(value, { stream: true })).split('\\n');
+    tail = lines.pop();
+    lines.filter(Boolean).forEach(l => addRow(JSON.parse(l)));
+  }
+  if (tail) addRow(JSON.parse(tail));
+  flush();
+}
+load();
+</script>
+</body>
+</html>
+"""
+_INDEX_HTML_GZ = gzip.compress(_INDEX_HTML, 9)  # compressed once at import
+_INDEX_ETAG = '"' + blake2b(_INDEX_HTML, digest_size=8).hexdigest() + '"'
+_INDEX_HEADERS = {
+    "etag": _INDEX_ETAG,
+    "cache-control": "public, max-age=60",
+    "vary": "accept-encoding",
+}
+
+
+@app.get("/")
+async def index(request: Request) -> Response:
+    """Minimal dashboard: renders the recent events table from /api/events."""
+    if request.headers.get("if-none-match") == _INDEX_ETAG:
+        return Response(status_code=304, headers=_INDEX_HEADERS)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        # serve the pre-gzipped body directly, bypassing the middleware
+        return Response(
+            content=_INDEX_HTML_GZ,
+            media_type="text/html",
+            headers=_INDEX_HEADERS | {"content-encoding": "gzip"},
+        )
+    return Response(
+        content=_INDEX_HTML, media_type="text/html", headers=_INDEX_HEADERS
+    )
+
+
+@app.get("/api/events", response_class=ORJSONResponse)
+async def get_events(limit: int = 200) -> ORJSONResponse:
+    """Return the most recent logged events, newest first, as JSON."""
+    # file read happens in a worker thread, not on the event loop
+    events = await asyncio.to_thread(read_last_events, limit)
+    return ORJSONResponse({"events": events, "count": len(events)})
+
+
+@app.get("/api/events.ndjson")
+async def get_events_ndjson(limit: int = 200) -> StreamingResponse:
+    """Stream the most recent events as newline-delimited JSON, newest first.
+
+    One line per event lets the dashboard render rows while the rest of the
+    response is still in flight, instead of waiting on one monolithic body.
+    """
+    events = await asyncio.to_thread(read_last_events, limit)
+
+    def lines():
+        for e in events:
+            yield orjson.dumps(e, option=orjson.OPT_APPEND_NEWLINE)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 if __name__ == "__main__":
+    import os
+
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Import-string form so workers > 1 actually fork; uvloop + httptools
+    # give a faster event loop and a C HTTP parser, and dropping the access
+    # log removes a logging record per request.
+    uvicorn.run(
+        "webhook_server:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=max(1, (os.cpu_count() or 2) // 2),
+        backlog=4096,
+        timeout_keep_alive=30,
+        log_level="warning",
+        access_log=False,
+    )